@@ -1,6 +1,7 @@
 """Application configuration constants."""
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB read chunks for uploads
 
 SUPPORTED_FORMATS = {
     "image/jpeg": [".jpg", ".jpeg"],
@@ -18,5 +19,10 @@ IMAGE_SIGNATURES = {
 MAX_CACHE_SIZE = 100
 MAX_BATCH_SIZE = 10
 
-RATE_LIMIT_SINGLE = "30/minute"
-RATE_LIMIT_BATCH = "10/minute"
+# Token-bucket rate limits per client: capacity is the burst budget,
+# refill restores it continuously. Batch requests cost one token per
+# image, so a 10-image batch draws 10x the quota of a single upload.
+RATE_LIMIT_SINGLE_CAPACITY = 30
+RATE_LIMIT_SINGLE_REFILL_PER_SEC = 30 / 60
+RATE_LIMIT_BATCH_CAPACITY = 100
+RATE_LIMIT_BATCH_REFILL_PER_SEC = 100 / 60
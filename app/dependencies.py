@@ -1,6 +1,68 @@
 """Shared dependencies."""
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import time
+import logging
 
-limiter = Limiter(key_func=get_remote_address)
+from fastapi import HTTPException, Request, status
+
+from app.config import (
+    RATE_LIMIT_SINGLE_CAPACITY,
+    RATE_LIMIT_SINGLE_REFILL_PER_SEC,
+    RATE_LIMIT_BATCH_CAPACITY,
+    RATE_LIMIT_BATCH_REFILL_PER_SEC
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """Per-client token-bucket rate limiter with weighted request costs.
+
+    Each client address gets a bucket of `capacity` tokens refilled
+    continuously at `refill_per_sec`. A request consumes `cost` tokens,
+    so heavier requests (larger batches) draw proportionally more quota
+    instead of counting the same as a single upload.
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        # client key -> (tokens remaining, last refill timestamp)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def check(self, request: Request, cost: float = 1) -> None:
+        """Consume cost tokens for this client, raising 429 if exhausted."""
+        key = request.client.host if request.client else "unknown"
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.refill_per_sec)
+
+        if tokens < cost:
+            self._buckets[key] = (tokens, now)
+            logger.warning(f"Rate limit exceeded for {key}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded."
+            )
+
+        self._prune(now)
+        self._buckets[key] = (tokens - cost, now)
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled to capacity to bound memory."""
+        if len(self._buckets) < 10000:
+            return
+        idle = [
+            key for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * self.refill_per_sec >= self.capacity
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+
+single_rate_limiter = TokenBucketLimiter(
+    RATE_LIMIT_SINGLE_CAPACITY, RATE_LIMIT_SINGLE_REFILL_PER_SEC
+)
+batch_rate_limiter = TokenBucketLimiter(
+    RATE_LIMIT_BATCH_CAPACITY, RATE_LIMIT_BATCH_REFILL_PER_SEC
+)
@@ -3,12 +3,9 @@
 import logging
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 
-from app.dependencies import limiter
 from app.routers import ocr
 
 # Configure logging
@@ -29,7 +26,7 @@ A serverless OCR API that extracts text from images using Google Cloud Vision AP
 - **Multi-format support:** JPG, PNG, GIF
 - **Confidence scores:** Block-level confidence from Vision API
 - **Text preprocessing:** Whitespace and linebreak normalization
-- **Rate limiting:** 30 requests/min (single), 10 requests/min (batch)
+- **Rate limiting:** per-client token buckets, weighted by batch size
 - **Caching:** SHA-256 based caching for identical images
 - **Batch processing:** Process up to 10 images per request
 - **Image metadata:** Optional EXIF and dimension extraction
@@ -40,8 +37,8 @@ No authentication required. Public API.
 ## Rate Limits
 | Endpoint | Limit |
 |----------|-------|
-| `/extract-text` | 30 requests/minute |
-| `/extract-text/batch` | 10 requests/minute |
+| `/extract-text` | 30 tokens/minute, 1 token per request |
+| `/extract-text/batch` | 100 tokens/minute, 1 token per image |
     """,
     version="1.0.0",
     contact={
@@ -50,32 +47,16 @@ No authentication required. Public API.
     license_info={
         "name": "MIT",
     },
+    default_response_class=ORJSONResponse,
 )
 
-# Attach limiter
-app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
-
 # Include router with tags
 app.include_router(ocr.router, tags=["OCR"])
 
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    logger.warning(f"Rate limit exceeded")
-    return JSONResponse(
-        status_code=429,
-        content={
-            "success": False,
-            "error": "Rate limit exceeded.",
-            "status_code": 429
-        }
-    )
-
-
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -1,27 +1,29 @@
 """OCR API endpoints."""
 
 import time
+import asyncio
 import logging
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, Request, Response, status
 
-from app.dependencies import limiter
+from app.dependencies import single_rate_limiter, batch_rate_limiter
 from app.config import MAX_FILE_SIZE, MAX_BATCH_SIZE
-from app.services.ocr import process_image
+from app.services.ocr import process_image, process_image_batch
+from app.services.cache import get_cache_key, read_and_hash
 from app.utils.validation import (
     is_valid_content_type,
     validate_image_signature,
-    validate_image_integrity,
     get_supported_formats
 )
-from app.utils.image import extract_metadata
+from app.utils.image import inspect_image
+from app.models import OCRResponse, BatchResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.post("/extract-text", summary="Extract text from image",
+    response_model=OCRResponse, response_model_exclude_none=True,
     responses={
         200: {"description": "Text extracted successfully"},
         400: {"description": "Empty or corrupted file"},
@@ -30,9 +32,9 @@ router = APIRouter()
         429: {"description": "Rate limit exceeded"},
         500: {"description": "OCR processing failed"}
     })
-@limiter.limit("30/minute")
 async def extract_text(
     request: Request,
+    response: Response,
     image: UploadFile = File(..., description="Image file (JPG, PNG, or GIF, max 10MB)"),
     include_metadata: bool = False
 ):
@@ -44,6 +46,8 @@ async def extract_text(
 
     Returns extracted text with confidence score and processing time.
     """
+    single_rate_limiter.check(request)
+
     start_time = time.time()
     logger.info(f"Processing image: {image.filename}")
 
@@ -54,7 +58,7 @@ async def extract_text(
             detail=f"Unsupported file type. Supported formats: {get_supported_formats()}"
         )
 
-    content = await image.read()
+    content, cache_key = await read_and_hash(image)
 
     if len(content) > MAX_FILE_SIZE:
         logger.warning(f"File too large: {len(content)} bytes")
@@ -70,6 +74,13 @@ async def extract_text(
             detail="Empty file uploaded."
         )
 
+    # Short-circuit repeat uploads of the same bytes: the ETag is the
+    # content hash, so a matching If-None-Match skips OCR and the body.
+    etag = f'"{cache_key}"'
+    if request.headers.get("if-none-match") == etag:
+        logger.info(f"ETag match for {cache_key[:8]}..., returning 304")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
     if not validate_image_signature(content):
         logger.warning("Invalid image signature (magic bytes)")
         raise HTTPException(
@@ -77,7 +88,10 @@ async def extract_text(
             detail="Invalid image file. File content does not match image format."
         )
 
-    if not validate_image_integrity(content):
+    # Pillow parsing is CPU-bound; keep it off the event loop. One parse
+    # covers both the integrity check and the optional metadata.
+    valid, metadata = await asyncio.to_thread(inspect_image, content, include_metadata)
+    if not valid:
         logger.warning("Corrupted image file")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,7 +99,7 @@ async def extract_text(
         )
 
     try:
-        result = await process_image(content)
+        result = await process_image(content, cache_key=cache_key)
         processing_time_ms = int((time.time() - start_time) * 1000)
 
         response_data = {
@@ -101,13 +115,12 @@ async def extract_text(
         if not result["text"]:
             response_data["message"] = "No text found in image"
 
-        if include_metadata:
-            metadata = extract_metadata(content)
-            if metadata:
-                response_data["metadata"] = metadata
+        if include_metadata and metadata:
+            response_data["metadata"] = metadata
 
         logger.info(f"Request completed in {processing_time_ms}ms")
-        return JSONResponse(content=response_data)
+        response.headers["ETag"] = etag
+        return OCRResponse(**response_data)
 
     except HTTPException:
         raise
@@ -120,15 +133,16 @@ async def extract_text(
 
 
 @router.post("/extract-text/batch", summary="Batch extract text from multiple images",
+    response_model=BatchResponse, response_model_exclude_none=True,
     responses={
         200: {"description": "Batch processed successfully"},
         400: {"description": "Batch size exceeded or invalid files"},
         429: {"description": "Rate limit exceeded"},
         500: {"description": "Processing failed"}
     })
-@limiter.limit("10/minute")
 async def extract_text_batch(
     request: Request,
+    response: Response,
     images: list[UploadFile] = File(..., description="Multiple image files (max 10)"),
     include_metadata: bool = False
 ):
@@ -140,9 +154,8 @@ async def extract_text_batch(
 
     Returns individual results for each image with success/failure status.
     """
-    start_time = time.time()
-    logger.info(f"Batch processing {len(images)} images")
-
+    # Reject malformed batches before charging the client's bucket, so
+    # an oversized batch gets its 400 instead of draining quota.
     if len(images) > MAX_BATCH_SIZE:
         logger.warning(f"Batch size exceeded: {len(images)}")
         raise HTTPException(
@@ -150,71 +163,109 @@ async def extract_text_batch(
             detail=f"Maximum {MAX_BATCH_SIZE} images per batch request."
         )
 
-    results = []
-    for idx, image in enumerate(images):
+    batch_rate_limiter.check(request, cost=max(1, len(images)))
+
+    start_time = time.time()
+    logger.info(f"Batch processing {len(images)} images")
+
+    digests: list[str] = [""] * len(images)
+
+    async def _validate_one(idx: int, image: UploadFile) -> tuple[dict, bytes | None, str, dict | None]:
+        """Validate one upload; returns (item_result, content, cache_key, metadata).
+
+        content is None when the item was rejected.
+        """
         item_result = {"index": idx, "filename": image.filename}
         logger.info(f"Processing batch item {idx}: {image.filename}")
 
         if not is_valid_content_type(image.content_type, image.filename or ""):
             item_result["success"] = False
             item_result["error"] = f"Unsupported file type. Supported formats: {get_supported_formats()}"
-            results.append(item_result)
-            continue
+            return item_result, None, "", None
 
-        content = await image.read()
+        content, cache_key = await read_and_hash(image)
+        digests[idx] = cache_key
 
         if len(content) > MAX_FILE_SIZE:
             item_result["success"] = False
             item_result["error"] = "File too large. Maximum size is 10MB."
-            results.append(item_result)
-            continue
+            return item_result, None, "", None
 
         if len(content) == 0:
             item_result["success"] = False
             item_result["error"] = "Empty file."
-            results.append(item_result)
-            continue
+            return item_result, None, "", None
 
         if not validate_image_signature(content):
             item_result["success"] = False
             item_result["error"] = "Invalid image file. File content does not match image format."
-            results.append(item_result)
-            continue
+            return item_result, None, "", None
 
-        if not validate_image_integrity(content):
+        valid, metadata = await asyncio.to_thread(inspect_image, content, include_metadata)
+        if not valid:
             item_result["success"] = False
             item_result["error"] = "Corrupted or invalid image file."
-            results.append(item_result)
-            continue
-
-        try:
-            ocr_result = await process_image(content)
-            item_result["success"] = True
-            item_result["text"] = ocr_result["text"]
-            item_result["confidence"] = ocr_result["confidence"]
-            if ocr_result.get("cached"):
-                item_result["cached"] = True
-            if not ocr_result["text"]:
-                item_result["message"] = "No text found in image"
-            if include_metadata:
-                metadata = extract_metadata(content)
-                if metadata:
-                    item_result["metadata"] = metadata
-        except Exception as e:
-            logger.error(f"Batch item {idx} failed: {e}")
+            return item_result, None, "", None
+
+        return item_result, content, cache_key, metadata
+
+    prepared = await asyncio.gather(
+        *[_validate_one(idx, image) for idx, image in enumerate(images)]
+    )
+
+    # All items that passed validation go to the Vision API in one
+    # batched call; cached items never leave the process.
+    valid = [(idx, content, cache_key)
+             for idx, (_, content, cache_key, _) in enumerate(prepared)
+             if content is not None]
+    ocr_results = await process_image_batch(
+        [(content, cache_key) for _, content, cache_key in valid]
+    )
+
+    for (idx, _, _), ocr_result in zip(valid, ocr_results):
+        item_result = prepared[idx][0]
+        if "error" in ocr_result:
+            logger.error(f"Batch item {idx} failed: {ocr_result['error']}")
             item_result["success"] = False
-            item_result["error"] = str(e)
-
-        results.append(item_result)
+            item_result["error"] = ocr_result["error"]
+            continue
+        item_result["success"] = True
+        item_result["text"] = ocr_result["text"]
+        item_result["confidence"] = ocr_result["confidence"]
+        if ocr_result.get("cached"):
+            item_result["cached"] = True
+        if not ocr_result["text"]:
+            item_result["message"] = "No text found in image"
+        metadata = prepared[idx][3]
+        if include_metadata and metadata:
+            item_result["metadata"] = metadata
+
+    results = [item_result for item_result, _, _, _ in prepared]
 
     processing_time_ms = int((time.time() - start_time) * 1000)
     processed_count = len([r for r in results if r.get("success")])
     logger.info(f"Batch completed: {processed_count}/{len(images)} in {processing_time_ms}ms")
 
-    return JSONResponse(content={
-        "success": True,
-        "total": len(images),
-        "processed": processed_count,
-        "results": results,
-        "processing_time_ms": processing_time_ms
-    })
+    # Weak ETag over the item count and per-item identity (filename,
+    # content digest, and error for items rejected before hashing), so
+    # batches that differ in membership or names never share an ETag;
+    # processing_time_ms varies per run, so the body is only
+    # semantically equivalent.
+    etag_parts = [str(len(images))]
+    for idx, (item_result, _, _, _) in enumerate(prepared):
+        etag_parts.append(
+            f"{item_result['filename']}:{digests[idx]}:{item_result.get('error', '')}"
+        )
+    etag = f'W/"{get_cache_key("|".join(etag_parts).encode())}"'
+    if request.headers.get("if-none-match") == etag:
+        logger.info("Batch ETag match, returning 304")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return BatchResponse(
+        success=True,
+        total=len(images),
+        processed=processed_count,
+        results=results,
+        processing_time_ms=processing_time_ms
+    )
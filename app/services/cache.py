@@ -2,32 +2,88 @@
 
 import hashlib
 import logging
+from collections import OrderedDict
 
-from app.config import MAX_CACHE_SIZE
+from fastapi import UploadFile
+
+from app.config import MAX_CACHE_SIZE, MAX_FILE_SIZE, UPLOAD_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
-_cache: dict[str, dict] = {}
+_cache: OrderedDict[str, dict] = OrderedDict()
+
+
+def _new_hasher():
+    """Create a SHA-256 hasher for cache keys.
+
+    usedforsecurity=False lets hashlib pick OpenSSL's EVP implementation,
+    which uses hardware SHA extensions where available.
+    """
+    return hashlib.new("sha256", usedforsecurity=False)
 
 
 def get_cache_key(content: bytes) -> str:
     """Generate SHA-256 hash for cache key."""
-    return hashlib.sha256(content).hexdigest()
+    hasher = _new_hasher()
+    hasher.update(memoryview(content))
+    return hasher.hexdigest()
+
+
+async def read_and_hash(upload: UploadFile,
+                        max_size: int = MAX_FILE_SIZE) -> tuple[bytes, str]:
+    """Read an upload in chunks, hashing incrementally.
+
+    Returns the file content and its SHA-256 hex digest, so callers can
+    reuse the digest as the cache key without a second full-buffer pass.
+    Reading stops as soon as max_size is exceeded, so an oversized upload
+    is never fully buffered; callers detect the overflow from the
+    returned length.
+    """
+    hasher = _new_hasher()
+    size = upload.size
+    if size is not None and 0 < size <= max_size:
+        # The multipart parser already knows the upload size, so
+        # preallocate the buffer once instead of growing it chunk by
+        # chunk; slice assignment below never reallocates.
+        buf = bytearray(size)
+        pos = 0
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            end = pos + len(chunk)
+            if end > size:
+                # Upload longer than declared; fall back to appending.
+                del buf[pos:]
+                buf += chunk
+            else:
+                buf[pos:end] = chunk
+            pos = end
+            if pos > max_size:
+                break
+        if pos < size:
+            del buf[pos:]
+    else:
+        buf = bytearray()
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            buf += chunk
+            if len(buf) > max_size:
+                break
+    return bytes(buf), hasher.hexdigest()
 
 
 def get_cached(key: str) -> dict | None:
     """Get cached result if exists."""
     if key in _cache:
         logger.info(f"Cache hit for {key[:8]}...")
+        _cache.move_to_end(key)
         return _cache[key]
     logger.info(f"Cache miss for {key[:8]}...")
     return None
 
 
 def set_cached(key: str, value: dict) -> None:
-    """Store result in cache."""
+    """Store result in cache, evicting the least recently used entry."""
     if len(_cache) >= MAX_CACHE_SIZE:
-        oldest_key = next(iter(_cache))
-        del _cache[oldest_key]
+        _cache.popitem(last=False)
         logger.debug("Cache eviction performed")
     _cache[key] = value
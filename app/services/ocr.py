@@ -1,6 +1,8 @@
 """OCR service using Google Cloud Vision API."""
 
+import asyncio
 import logging
+import threading
 
 from google.cloud import vision
 from fastapi import HTTPException, status
@@ -10,14 +12,33 @@ from app.services.cache import get_cache_key, get_cached, set_cached
 
 logger = logging.getLogger(__name__)
 
+# In-flight OCR calls keyed by cache key, so concurrent requests for the
+# same image share a single Vision API call.
+_inflight: dict[str, "asyncio.Future[dict]"] = {}
 
-def perform_ocr(content: bytes) -> dict:
-    """Perform OCR using Google Cloud Vision API."""
-    logger.info("Calling Vision API for OCR")
-    client = vision.ImageAnnotatorClient()
-    vision_image = vision.Image(content=content)
-    response = client.document_text_detection(image=vision_image)
+_client: vision.ImageAnnotatorClient | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> vision.ImageAnnotatorClient:
+    """Return the shared Vision client, creating it on first use.
+
+    Client construction reads credentials and opens a gRPC channel, so
+    the instance is created lazily once and reused; the channel
+    multiplexes concurrent calls over HTTP/2. Callers run in worker
+    threads, so creation is guarded by a lock to avoid racing two
+    clients into existence and leaking a channel.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = vision.ImageAnnotatorClient()
+    return _client
 
+
+def _parse_response(response) -> dict:
+    """Extract text and mean block confidence from an annotate response."""
     if response.error.message:
         logger.error(f"Vision API error: {response.error.message}")
         raise HTTPException(
@@ -33,34 +54,154 @@ def perform_ocr(content: bytes) -> dict:
     logger.info(f"Extracted {len(extracted_text)} characters")
 
     confidence = 0.0
-    if response.full_text_annotation.pages:
-        confidences = []
-        for page in response.full_text_annotation.pages:
-            for block in page.blocks:
-                if block.confidence > 0:
-                    confidences.append(block.confidence)
-        if confidences:
-            confidence = sum(confidences) / len(confidences)
+    total = 0.0
+    count = 0
+    for page in response.full_text_annotation.pages:
+        for block in page.blocks:
+            if block.confidence > 0:
+                total += block.confidence
+                count += 1
+    if count:
+        confidence = total / count
 
     return {"text": extracted_text, "confidence": confidence}
 
 
-async def process_image(content: bytes, use_cache: bool = True) -> dict:
-    """Process image with caching support."""
-    cache_key = get_cache_key(content)
+def perform_ocr(content: bytes) -> dict:
+    """Perform OCR using Google Cloud Vision API."""
+    logger.info("Calling Vision API for OCR")
+    client = _get_client()
+    vision_image = vision.Image(content=content)
+    response = client.document_text_detection(image=vision_image)
+    return _parse_response(response)
+
+
+def perform_ocr_batch(contents: list[bytes]) -> list[dict]:
+    """Perform OCR on several images in a single batch RPC.
+
+    Returns one dict per image in order; items the Vision API rejected
+    carry an "error" key instead of text so one bad image does not fail
+    the whole batch.
+    """
+    logger.info(f"Calling Vision API for batch OCR of {len(contents)} images")
+    client = _get_client()
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    requests = [
+        vision.AnnotateImageRequest(image=vision.Image(content=content), features=[feature])
+        for content in contents
+    ]
+    batch_response = client.batch_annotate_images(requests=requests)
+
+    results = []
+    for response in batch_response.responses:
+        try:
+            results.append(_parse_response(response))
+        except HTTPException as e:
+            results.append({"error": e.detail})
+    return results
+
+
+async def process_image(content: bytes, use_cache: bool = True,
+                        cache_key: str | None = None) -> dict:
+    """Process image with caching support.
+
+    Accepts a precomputed cache key (the upload's SHA-256 digest) to
+    avoid hashing the full buffer a second time.
+    """
+    if cache_key is None:
+        cache_key = get_cache_key(content)
 
     if use_cache:
         cached = get_cached(cache_key)
         if cached:
             return {**cached, "cached": True}
 
-    ocr_result = perform_ocr(content)
-    result = {
-        "text": preprocess_text(ocr_result["text"]),
-        "confidence": round(ocr_result["confidence"], 4)
-    }
+        inflight = _inflight.get(cache_key)
+        if inflight is not None:
+            logger.info(f"Joining in-flight OCR for {cache_key[:8]}...")
+            return dict(await inflight)
 
+    future: "asyncio.Future[dict] | None" = None
     if use_cache:
-        set_cached(cache_key, result)
-
-    return result
+        future = asyncio.get_running_loop().create_future()
+        _inflight[cache_key] = future
+
+    try:
+        # perform_ocr is blocking gRPC; run it in a worker thread so the
+        # event loop stays free for other requests.
+        ocr_result = await asyncio.to_thread(perform_ocr, content)
+        result = {
+            "text": preprocess_text(ocr_result["text"]),
+            "confidence": round(ocr_result["confidence"], 4)
+        }
+
+        if use_cache:
+            set_cached(cache_key, result)
+            future.set_result(result)
+
+        return result
+    except Exception as e:
+        if future is not None and not future.done():
+            future.set_exception(e)
+            # Mark the exception retrieved so a flight with no joiners
+            # doesn't log "Future exception was never retrieved" at GC;
+            # waiters that did join still get it raised on await.
+            future.exception()
+        raise
+    finally:
+        if use_cache:
+            _inflight.pop(cache_key, None)
+
+
+async def process_image_batch(items: list[tuple[bytes, str]],
+                              use_cache: bool = True) -> list[dict]:
+    """Process several images, batching cache misses into one Vision RPC.
+
+    Each item is (content, cache_key). Returns one result dict per item
+    in order; items that failed OCR carry an "error" key. Duplicate
+    images within the batch are only sent to the Vision API once.
+    """
+    results: list[dict] = [{} for _ in items]
+    pending: dict[str, list[int]] = {}
+    miss_contents: list[bytes] = []
+    miss_keys: list[str] = []
+
+    for i, (content, cache_key) in enumerate(items):
+        if use_cache:
+            cached = get_cached(cache_key)
+            if cached:
+                results[i] = {**cached, "cached": True}
+                continue
+        if cache_key in pending:
+            pending[cache_key].append(i)
+        else:
+            pending[cache_key] = [i]
+            miss_keys.append(cache_key)
+            miss_contents.append(content)
+
+    if not miss_contents:
+        return results
+
+    try:
+        ocr_results = await asyncio.to_thread(perform_ocr_batch, miss_contents)
+    except Exception as e:
+        logger.error(f"Batch OCR call failed: {e}")
+        for key in miss_keys:
+            for i in pending[key]:
+                results[i] = {"error": str(e)}
+        return results
+
+    for key, ocr_result in zip(miss_keys, ocr_results):
+        if "error" in ocr_result:
+            result = ocr_result
+        else:
+            result = {
+                "text": preprocess_text(ocr_result["text"]),
+                "confidence": round(ocr_result["confidence"], 4)
+            }
+            if use_cache:
+                set_cached(key, result)
+        for i in pending[key]:
+            results[i] = dict(result)
+
+    return results
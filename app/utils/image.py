@@ -10,22 +10,31 @@ from PIL.ExifTags import TAGS
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; preprocess_text runs on every OCR result.
+_INLINE_WS_RE = re.compile(r'[ \t]+')
+_EXTRA_NEWLINES_RE = re.compile(r'\n{3,}')
+
+# EXIF tags worth returning, resolved to numeric IDs at import so the
+# per-image loop is a single integer set lookup per entry.
+_WANTED_EXIF = {"Make", "Model", "DateTime", "Software", "Orientation"}
+_WANTED_TAG_IDS = {
+    tag_id: name for tag_id, name in TAGS.items() if name in _WANTED_EXIF
+}
+
 
 def preprocess_text(text: str) -> str:
     """Clean and normalize extracted text."""
     if not text:
         return ""
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
+    text = _INLINE_WS_RE.sub(' ', text)
+    text = _EXTRA_NEWLINES_RE.sub('\n\n', text)
+    text = '\n'.join(line.strip() for line in text.split('\n'))
     return text.strip()
 
 
-def extract_metadata(content: bytes) -> Optional[dict]:
-    """Extract image metadata including EXIF data."""
+def _extract_from_image(img: Image.Image) -> Optional[dict]:
+    """Extract metadata from an already-opened image."""
     try:
-        img = Image.open(BytesIO(content))
         metadata = {
             "format": img.format,
             "mode": img.mode,
@@ -36,14 +45,42 @@ def extract_metadata(content: bytes) -> Optional[dict]:
         if exif_data:
             exif = {}
             for tag_id, value in exif_data.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if isinstance(value, bytes):
+                tag = _WANTED_TAG_IDS.get(tag_id)
+                if tag is None or isinstance(value, bytes):
                     continue
-                if tag in ["Make", "Model", "DateTime", "Software", "Orientation"]:
-                    exif[tag] = str(value)
+                exif[tag] = str(value)
             if exif:
                 metadata["exif"] = exif
         return metadata
     except Exception as e:
         logger.debug(f"Failed to extract metadata: {e}")
         return None
+
+
+def extract_metadata(content: bytes) -> Optional[dict]:
+    """Extract image metadata including EXIF data."""
+    try:
+        img = Image.open(BytesIO(content))
+    except Exception as e:
+        logger.debug(f"Failed to extract metadata: {e}")
+        return None
+    return _extract_from_image(img)
+
+
+def inspect_image(content: bytes, include_metadata: bool = False) -> tuple[bool, Optional[dict]]:
+    """Validate the image header and optionally extract metadata.
+
+    Opens the image once, so callers that need both the integrity check
+    and metadata avoid a second full PIL parse. Returns (valid, metadata);
+    metadata is None unless requested and extractable.
+    """
+    try:
+        img = Image.open(BytesIO(content))
+        width, height = img.size
+    except Exception:
+        return False, None
+    if width <= 0 or height <= 0:
+        return False, None
+    if not include_metadata:
+        return True, None
+    return True, _extract_from_image(img)
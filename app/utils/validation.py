@@ -5,6 +5,12 @@ from PIL import Image
 
 from app.config import SUPPORTED_FORMATS, IMAGE_SIGNATURES, MAX_FILE_SIZE
 
+# Signatures indexed by their first byte so validation checks only the
+# candidates that can possibly match.
+_SIG_BY_FIRST_BYTE: dict[int, list[bytes]] = {}
+for _sig in IMAGE_SIGNATURES:
+    _SIG_BY_FIRST_BYTE.setdefault(_sig[0], []).append(_sig)
+
 
 def is_valid_content_type(content_type: str, filename: str) -> bool:
     """Validate file by content type or extension."""
@@ -19,18 +25,25 @@ def is_valid_content_type(content_type: str, filename: str) -> bool:
 
 def validate_image_signature(content: bytes) -> bool:
     """Validate image by checking magic bytes."""
-    for signature in IMAGE_SIGNATURES:
-        if content.startswith(signature):
-            return True
-    return False
+    if not content:
+        return False
+    candidates = _SIG_BY_FIRST_BYTE.get(content[0])
+    if not candidates:
+        return False
+    return any(content.startswith(signature) for signature in candidates)
 
 
 def validate_image_integrity(content: bytes) -> bool:
-    """Verify image can be opened and is not corrupted."""
+    """Verify the image header parses as a valid image.
+
+    Image.open only reads the header, which is enough to reject
+    non-images and truncated headers; a full img.verify() would rescan
+    the entire file (IDAT CRCs, JPEG scan data) per request.
+    """
     try:
-        img = Image.open(BytesIO(content))
-        img.verify()
-        return True
+        with Image.open(BytesIO(content)) as img:
+            width, height = img.size
+            return width > 0 and height > 0
     except Exception:
         return False
 